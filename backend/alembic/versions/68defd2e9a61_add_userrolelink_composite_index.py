@@ -0,0 +1,27 @@
+"""add userrolelink composite index
+
+Revision ID: 68defd2e9a61
+Revises: 28210de8f66a
+Create Date: 2026-08-31 10:22:47.531208
+
+"""
+from typing import Sequence
+
+from alembic import op
+import sqlmodel
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '68defd2e9a61'
+down_revision: str | None = '28210de8f66a'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_userrolelink_role_id_user_id', 'userrolelink', ['role_id', 'user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_userrolelink_role_id_user_id', table_name='userrolelink')
@@ -0,0 +1,32 @@
+"""use native uuid columns on postgres
+
+Revision ID: f3c41b8d0a27
+Revises: 68defd2e9a61
+Create Date: 2026-08-31 14:05:12.847615
+
+"""
+from typing import Sequence
+
+from alembic import op
+import sqlmodel
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c41b8d0a27'
+down_revision: str | None = '68defd2e9a61'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+UUID_TABLES = ("user", "exercise", "workout", "workoutexercise", "exerciselog")
+
+
+def upgrade() -> None:
+    for table in UUID_TABLES:
+        op.alter_column(table, "uuid", type_=postgresql.UUID(as_uuid=True), postgresql_using="uuid::uuid")
+
+
+def downgrade() -> None:
+    for table in UUID_TABLES:
+        op.alter_column(table, "uuid", type_=sa.VARCHAR(36), postgresql_using="uuid::varchar")
@@ -77,7 +77,7 @@ def populate_exercise_data(engine: Engine):
 # Engine setting and event listening setup
 
 postgres_url = config("POSTGRES_URL")
-engine = create_engine(postgres_url, echo=False)
+engine = create_engine(postgres_url, echo=False, pool_size=10, max_overflow=20, pool_pre_ping=True, pool_recycle=1800)
 
 setup_database(engine)
 populate_exercise_data(engine)
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Request, HTTPException 
+from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pyngrok import ngrok
 import uvicorn
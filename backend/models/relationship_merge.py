@@ -1,5 +1,5 @@
 from uuid import UUID
-from sqlmodel import SQLModel, Relationship, Field, Column, Integer, ForeignKey
+from sqlmodel import SQLModel, Relationship, Field, Column, Integer, ForeignKey, Index
 from models.user import UserTableBase
 from models.exercise import ExerciseTableBase
 from models.exercise_log import ExerciseLogTableBase
@@ -13,6 +13,7 @@ class WorkoutExerciseWorkoutOrderLink(SQLModel, table=True):
     exercise_order: int | None = Field(default=None, sa_column=Column(Integer, index=True))
     
 class UserRoleLink(SQLModel, table=True):
+    __table_args__ = (Index("ix_userrolelink_role_id_user_id", "role_id", "user_id"),)
     user_id: int | None = Field(default=None, sa_column=Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True, index=True))
     role_id: int | None = Field(default=None, sa_column=Column(Integer, ForeignKey("role.id", ondelete="CASCADE"), primary_key=True, index=True))
 
@@ -53,6 +54,10 @@ class User(UserTableBase, table=True):
     roles: list['Role'] = Relationship(back_populates="users", link_model=UserRoleLink, sa_relationship_kwargs={"lazy": "select"})
     exercises: list['Exercise'] = Relationship(back_populates="user")
 
+    @property
+    def role_names(self) -> list[str]:
+        return [role.name for role in self.roles]
+
 class WorkoutExercise(WorkoutExerciseTableBase, table=True):
     workout: list['Workout'] = Relationship(back_populates="workout_exercises", link_model=WorkoutExerciseWorkoutOrderLink)
 
@@ -5,7 +5,7 @@ from models.exercise import ExerciseBase
 from models.workout_exercise import WorkoutExerciseBase
 from models.workout import WorkoutBase
 from models.user import UserBase
-from models.relationship_merge import Exercise
+from models.relationship_merge import Exercise, User
 
 
 class ExerciseResponseData(ExerciseBase):
@@ -80,11 +80,17 @@ class UserResponseData(UserBase):
     uuid: UUID
     username: str
     roles: list[str]
-    
-class UserResponse(SQLModel):
-    data: UserResponseData
-    detail: str
 
-class UserListResponse(SQLModel):
-    data: list[UserResponseData]
-    detail: str
+    @classmethod
+    def from_orm(cls, db_obj: User):
+        return cls.model_construct(
+            uuid = db_obj.uuid,
+            username = db_obj.username,
+            first_name = db_obj.first_name,
+            last_name = db_obj.last_name,
+            birthday = db_obj.birthday,
+            body_weight = db_obj.body_weight,
+            height = db_obj.height,
+            gender = db_obj.gender,
+            roles = db_obj.role_names
+        )
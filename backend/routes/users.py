@@ -1,200 +1,209 @@
 from uuid import UUID
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, status, Depends, Security
-from sqlmodel import Session, select
-from sqlalchemy.orm import joinedload
+import orjson
+from fastapi import APIRouter, HTTPException, status, Depends, Security, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select, update, or_
+from sqlalchemy import bindparam
+from sqlalchemy.orm import selectinload
 
 from db import engine, get_db
 from models.user import UserCreateReq, UserPatchReq, UserPutReq, UserUsernamePatchReq, UserPasswordPatchReq, UserRolePatchReq
 from models.relationship_merge import User
-from models.responses import UserResponseData, UserResponse, UserListResponse
-from models.relationship_merge import Role
+from models.responses import UserResponseData
+from models.relationship_merge import Role, UserRoleLink
 from utilities.authorization import check_roles, get_current_user
 
 router = APIRouter()
 
+_user_role_id: int | None = None
+
+users_by_role_stmt = select(User).options(selectinload(User.roles)).join(User.roles).where(Role.name == bindparam("role_name"))
+
+def get_user_role_id(session: Session) -> int:
+    global _user_role_id
+    if _user_role_id is None:
+        _user_role_id = session.exec(select(Role.id).where(Role.name == "User")).first()
+    return _user_role_id
+
+def orjson_response(content: dict, status_code: int = status.HTTP_200_OK) -> Response:
+    return Response(content=orjson.dumps(content), media_type="application/json", status_code=status_code)
+
+def get_users_by_role(role_name: str, session: Session) -> Response:
+    users = session.exec(users_by_role_stmt, params={"role_name": role_name}).all()
+    data = [UserResponseData.from_orm(user) for user in users]
+    noun = role_name.lower()
+    return orjson_response({"data": [item.model_dump(mode="json") for item in data], "detail": f"{len(data)} {noun}s fetched successfully." if len(data) != 1 else f"{len(data)} {noun} fetched successfully."})
+
 
 # Get Requests 
-@router.get("/users/all", response_model=UserListResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.get("/users/all", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def get_users_and_admins(current_user: Annotated[User, Security(get_current_user)], session: Session = Depends(get_db)) -> UserListResponse:
-    current_user = session.exec(select(User).where(User.id == current_user.id)).first()
-    users = session.exec(select(User)).all()
-    data = [UserResponseData.model_validate(user, update={"roles":[role.name for role in user.roles]}) for user in users]
-    return UserListResponse(data=data, detail=f"{len(data)} users fetched successfully." if len(data) != 1 else f"{len(data)} user fetched successfully.")
-
-@router.get("/users/me", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["User", "Admin"])
+async def get_users_and_admins(current_user: Annotated[User, Security(get_current_user)], session: Session = Depends(get_db)) -> StreamingResponse:
+    users = session.exec(select(User).options(selectinload(User.roles)).execution_options(yield_per=500))
+    def stream_users():
+        count = 0
+        yield b'{"data":['
+        for user in users:
+            if count:
+                yield b","
+            count += 1
+            yield orjson.dumps(UserResponseData.from_orm(user).model_dump(mode="json"))
+        detail = f"{count} users fetched successfully." if count != 1 else f"{count} user fetched successfully."
+        yield b'],"detail":' + orjson.dumps(detail) + b"}"
+    return StreamingResponse(stream_users(), media_type="application/json")
+
+@router.get("/users/me", status_code=status.HTTP_200_OK, tags=["User", "Admin"])
 @check_roles(["User", "Admin"])
-async def get_logged_in_user(current_user: Annotated[User, Security(get_current_user)], session: Session = Depends(get_db)) -> UserResponse:
-    current_user = session.exec(select(User).where(User.id == current_user.id)).first()
-    data = UserResponseData.model_validate(current_user, update={"roles":[role.name for role in current_user.roles]})
-    return UserResponse(data=data, detail="User fetched successfully.")
+async def get_logged_in_user(current_user: Annotated[User, Security(get_current_user)], session: Session = Depends(get_db)) -> Response:
+    data = UserResponseData.from_orm(current_user)
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User fetched successfully."})
 
-@router.get("/users/admins", response_model=UserListResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.get("/users/admins", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def get_admins(current_user: Annotated[User, Security(get_current_user)], session: Session = Depends(get_db)) -> UserListResponse:
-    admins = session.exec(select(User).join(User.roles).where(Role.name == "Admin")).all()
-    data = [UserResponseData.model_validate(admin, update={"roles": [role.name for role in admin.roles]}) for admin in admins]
-    return UserListResponse(data=data, detail=f"{len(data)} admins fetched successfully." if len(data) != 1 else f"{len(data)} admin fetched successfully.")
+async def get_admins(current_user: Annotated[User, Security(get_current_user)], session: Session = Depends(get_db)) -> Response:
+    return get_users_by_role("Admin", session)
 
-@router.get("/users/users", response_model=UserListResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.get("/users/users", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def get_users(current_user: Annotated[User, Security(get_current_user)], session: Session = Depends(get_db)) -> UserListResponse:
-    users = session.exec(select(User).join(User.roles).where(Role.name == "User")).all()
-    data = [UserResponseData.model_validate(user, update={"roles": [role.name for role in user.roles]}) for user in users]
-    return UserListResponse(data=data, detail=f"{len(data)} users fetched successfully." if len(data) != 1 else f"{len(data)} user fetched successfully.")
+async def get_users(current_user: Annotated[User, Security(get_current_user)], session: Session = Depends(get_db)) -> Response:
+    return get_users_by_role("User", session)
 
-@router.get("/users/{user_uuid:uuid}", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.get("/users/{user_uuid:uuid}", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def get_specific_user(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, session: Session = Depends(get_db)) -> UserResponse:
-    current_user = session.exec(select(User).where(User.id == current_user.id)).first()
-    user = session.exec(select(User).where(User.uuid == user_uuid)).first()
-    if not current_user:
+async def get_specific_user(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, session: Session = Depends(get_db)) -> Response:
+    user = session.exec(select(User).options(selectinload(User.roles)).where(User.uuid == user_uuid)).first()
+    if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User UUID: {user_uuid} not found.")
-    data = UserResponseData.model_validate(user, update={"roles": [role.name for role in user.roles]})
-    return UserResponse(data=data, detail="User fetched successfully.")
+    data = UserResponseData.from_orm(user)
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User fetched successfully."})
 
 # Post Requests
 
-@router.post("/users/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED, tags=["Authorization"])
-async def add_user(create_user_request: UserCreateReq, session: Session = Depends(get_db)) -> UserResponse:
+@router.post("/users/register", status_code=status.HTTP_201_CREATED, tags=["Authorization"])
+async def add_user(create_user_request: UserCreateReq, session: Session = Depends(get_db)) -> Response:
     username = create_user_request.username
-    if session.exec(select(User).where(User.username == username)).first():
+    if session.exec(select(User.id).where(User.username == username)).first():
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Username: {username} already exists.")
     user = User.model_validate(create_user_request.model_dump())
-    user_role = session.exec(select(Role).where(Role.name == "User")).first()
-    user.roles.append(user_role)
     session.add(user)
-    print(type(user.uuid))
+    session.flush()
+    session.add(UserRoleLink(user_id=user.id, role_id=get_user_role_id(session)))
+    data = UserResponseData.from_orm(user)
     session.commit()
-    session.refresh(user)
-    data = UserResponseData.model_validate(user, update={"roles": [role.name for role in user.roles]})
-    return UserResponse(data=data, detail="New User has been added.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "New User has been added."}, status_code=status.HTTP_201_CREATED)
 
 # Put Requests
 
-@router.put("/users/me", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["User", "Admin"])
+@router.put("/users/me", status_code=status.HTTP_200_OK, tags=["User", "Admin"])
 @check_roles(["User", "Admin"])
-async def update_logged_in_user(current_user: Annotated[User, Security(get_current_user)], update_user_request: UserPutReq, session: Session = Depends(get_db)) -> UserResponse:
-    current_user = session.exec(select(User).where(User.id == current_user.id)).first()
-    for attr, value in update_user_request.model_dump().items():
-        setattr(current_user, attr, value) 
+async def update_logged_in_user(current_user: Annotated[User, Security(get_current_user)], update_user_request: UserPutReq, session: Session = Depends(get_db)) -> Response:
+    session.exec(update(User).where(User.id == current_user.id).values(**update_user_request.model_dump()))
+    data = UserResponseData.from_orm(current_user)
     session.commit()
-    session.refresh(current_user)
-    data = UserResponseData.model_validate(current_user, update={"roles": [role.name for role in current_user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
-@router.put("/users/{user_uuid:uuid}", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.put("/users/{user_uuid:uuid}", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def update_user(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserPutReq, session: Session = Depends(get_db)) -> UserResponse:
-    user = session.exec(select(User).where(User.uuid == user_uuid)).first()
+async def update_user(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserPutReq, session: Session = Depends(get_db)) -> Response:
+    user = session.exec(select(User).options(selectinload(User.roles)).where(User.uuid == user_uuid)).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User UUID: {user_uuid} not found.")
-    for attr, value in update_user_request.model_dump().items():
-        setattr(user, attr, value) 
+    session.exec(update(User).where(User.id == user.id).values(**update_user_request.model_dump()))
+    data = UserResponseData.from_orm(user)
     session.commit()
-    session.refresh(user)
-    data = UserResponseData.model_validate(user, update={"roles": [role.name for role in user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
 # Patch Requests
 
-@router.patch("/users/me", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["User", "Admin"])
+@router.patch("/users/me", status_code=status.HTTP_200_OK, tags=["User", "Admin"])
 @check_roles(["User", "Admin"])
-async def patch_logged_in_user(current_user: Annotated[User, Security(get_current_user)], update_user_request: UserPatchReq, session: Session = Depends(get_db)) -> UserResponse:
-    current_user = session.exec(select(User).where(User.id == current_user.id)).first()
-    for attr, value in update_user_request.model_dump(exclude_unset=True).items():
-        setattr(current_user, attr, value) 
+async def patch_logged_in_user(current_user: Annotated[User, Security(get_current_user)], update_user_request: UserPatchReq, session: Session = Depends(get_db)) -> Response:
+    values = update_user_request.model_dump(exclude_unset=True)
+    if values:
+        session.exec(update(User).where(User.id == current_user.id).values(**values))
+    data = UserResponseData.from_orm(current_user)
     session.commit()
-    session.refresh(current_user)
-    data = UserResponseData.model_validate(current_user, update={"roles": [role.name for role in current_user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
-@router.patch("/users/{user_uuid:uuid}", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.patch("/users/{user_uuid:uuid}", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def patch_user(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserPatchReq, session: Session = Depends(get_db)) -> UserResponse:
-    user = session.exec(select(User).where(User.uuid == user_uuid)).first()
+async def patch_user(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserPatchReq, session: Session = Depends(get_db)) -> Response:
+    user = session.exec(select(User).options(selectinload(User.roles)).where(User.uuid == user_uuid)).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User UUID: {user_uuid} not found.")
-    for attr, value in update_user_request.model_dump(exclude_unset=True).items():
-        setattr(user, attr, value) 
+    values = update_user_request.model_dump(exclude_unset=True)
+    if values:
+        session.exec(update(User).where(User.id == user.id).values(**values))
+    data = UserResponseData.from_orm(user)
     session.commit()
-    session.refresh(user)
-    data = UserResponseData.model_validate(user, update={"roles": [role.name for role in user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
-@router.patch("/users/me/change_username", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["User", "Admin"])
+@router.patch("/users/me/change_username", status_code=status.HTTP_200_OK, tags=["User", "Admin"])
 @check_roles(["User", "Admin"])
-async def patch_logged_in_user_username(current_user: Annotated[User, Security(get_current_user)], update_user_request: UserUsernamePatchReq, session: Session = Depends(get_db)) -> UserResponse:
-    current_user = session.exec(select(User).where(User.id == current_user.id)).first()
-    if session.exec(select(User).where(User.id != current_user.id).where(User.username == update_user_request.username)).first():
+async def patch_logged_in_user_username(current_user: Annotated[User, Security(get_current_user)], update_user_request: UserUsernamePatchReq, session: Session = Depends(get_db)) -> Response:
+    if session.exec(select(User.id).where(User.id != current_user.id).where(User.username == update_user_request.username)).first():
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Username: {update_user_request.username} already exists.")
     current_user.username = update_user_request.username
+    data = UserResponseData.from_orm(current_user)
     session.commit()
-    session.refresh(current_user)
-    data = UserResponseData.model_validate(current_user, update={"roles": [role.name for role in current_user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
-@router.patch("/users/{user_uuid:uuid}/change_username", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.patch("/users/{user_uuid:uuid}/change_username", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def patch_user_username(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserUsernamePatchReq, session: Session = Depends(get_db)) -> UserResponse:
+async def patch_user_username(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserUsernamePatchReq, session: Session = Depends(get_db)) -> Response:
     if current_user.uuid == user_uuid:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot change your own username.")
-    user = session.exec(select(User).where(User.uuid == user_uuid)).first()
+    users = session.exec(select(User).options(selectinload(User.roles)).where(or_(User.uuid == user_uuid, User.username == update_user_request.username))).all()
+    user = next((fetched_user for fetched_user in users if fetched_user.uuid == user_uuid), None)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User UUID: {user_uuid} not found.")
-    if session.exec(select(User).where(User.username == update_user_request.username)).first():
+    if any(fetched_user.username == update_user_request.username for fetched_user in users):
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Username: {update_user_request.username} already exists.")
     user.username = update_user_request.username
+    data = UserResponseData.from_orm(user)
     session.commit()
-    session.refresh(user)
-    data = UserResponseData.model_validate(user, update={"roles": [role.name for role in user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
-@router.patch("/users/me/change_password", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["User", "Admin"])
+@router.patch("/users/me/change_password", status_code=status.HTTP_200_OK, tags=["User", "Admin"])
 @check_roles(["User", "Admin"])
-async def patch_logged_in_user_password(current_user: Annotated[User, Security(get_current_user)], update_user_request: UserPasswordPatchReq, session: Session = Depends(get_db)) -> UserResponse:
-    current_user = session.exec(select(User).where(User.id == current_user.id)).first()
+async def patch_logged_in_user_password(current_user: Annotated[User, Security(get_current_user)], update_user_request: UserPasswordPatchReq, session: Session = Depends(get_db)) -> Response:
     current_user.hashed_password = update_user_request.password
+    data = UserResponseData.from_orm(current_user)
     session.commit()
-    session.refresh(current_user)
-    data = UserResponseData.model_validate(current_user, update={"roles": [role.name for role in current_user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
-@router.patch("/users/{user_uuid:uuid}/change_password", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.patch("/users/{user_uuid:uuid}/change_password", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def patch_user_password(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserPasswordPatchReq, session: Session = Depends(get_db)) -> UserResponse:
+async def patch_user_password(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserPasswordPatchReq, session: Session = Depends(get_db)) -> Response:
     if current_user.uuid == user_uuid:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot change your own password.")
-    user = session.exec(select(User).where(User.uuid == user_uuid)).first()
+    user = session.exec(select(User).options(selectinload(User.roles)).where(User.uuid == user_uuid)).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User UUID: {user_uuid} not found.")
     user.hashed_password = update_user_request.password
+    data = UserResponseData.from_orm(user)
     session.commit()
-    session.refresh(user)
-    data = UserResponseData.model_validate(user, update={"roles": [role.name for role in user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
-@router.patch("/users/{user_uuid:uuid}/change_roles", response_model=UserResponse, status_code=status.HTTP_200_OK, tags=["Admin"])
+@router.patch("/users/{user_uuid:uuid}/change_roles", status_code=status.HTTP_200_OK, tags=["Admin"])
 @check_roles(["Admin"])
-async def patch_user_role(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserRolePatchReq, session: Session = Depends(get_db)) -> UserResponse:
+async def patch_user_role(current_user: Annotated[User, Security(get_current_user)], user_uuid: UUID, update_user_request: UserRolePatchReq, session: Session = Depends(get_db)) -> Response:
     if current_user.uuid == user_uuid:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot change your own roles.")
-    user = session.exec(select(User).where(User.uuid == user_uuid)).first()
+    user = session.exec(select(User).options(selectinload(User.roles)).where(User.uuid == user_uuid)).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User UUID: {user_uuid} not found.")
-    roles = []
-    for role in update_user_request.roles:
-        role = session.exec(select(Role).where(Role.name == role)).first()
-        if not role:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Role: {role} not found.")
-        roles.append(role)
-    user.roles = roles 
+    roles = session.exec(select(Role).where(Role.name.in_(update_user_request.roles))).all()
+    found_role_names = {role.name for role in roles}
+    for role_name in update_user_request.roles:
+        if role_name not in found_role_names:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Role: {role_name} not found.")
+    user.roles = roles
+    data = UserResponseData.from_orm(user)
     session.commit()
-    session.refresh(user)
-    data = UserResponseData.model_validate(user, update={"roles": [role.name for role in user.roles]})
-    return UserResponse(data=data, detail="User updated.")
+    return orjson_response({"data": data.model_dump(mode="json"), "detail": "User updated."})
 
 # Delete Requests 
 
@@ -95,6 +95,43 @@ def test_get_users(client_full_db: TestClient, session: Session):
         'detail': '4 users fetched successfully.'
     }
 
+def test_get_users_and_admins(client_login: TestClient, session: Session):
+    client: TestClient = client_login("admin", "admin")
+    response: Response = client.get("/users/all")
+    response_dict: dict[str, object] = response.json()
+    assert response.status_code == 200
+    assert response_dict == {
+        'data': [
+            {
+                "uuid": str(session.exec(select(User).where(User.username == "admin")).first().uuid),
+                "username": "admin",
+                "first_name": "Admin",
+                "last_name": "Admin",
+                "birthday": "2020-05-03",
+                "body_weight": 200.0,
+                "height": 80,
+                "roles": [
+                    "Admin"
+                ],
+                "gender": "male"
+                },
+            {
+                "uuid": str(session.exec(select(User).where(User.username == "user")).first().uuid),
+                "username": "user",
+                "first_name": "User",
+                "last_name": "User",
+                "birthday": "2024-01-01",
+                "body_weight": 100.0,
+                "height": 70,
+                "roles": [
+                    "User"
+                ],
+                "gender": "male"
+                }
+            ],
+        'detail': '2 users fetched successfully.',
+        }
+
 def test_post_user(client_login: TestClient, session: Session):
     client: TestClient = client_login("admin", "admin")
     user = session.exec(select(User).where(User.username == 'admin')).first()
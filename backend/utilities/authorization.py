@@ -4,13 +4,15 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
 from sqlmodel import SQLModel, Session, select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import bindparam
+from sqlalchemy.orm import selectinload
 from pydantic import ValidationError
 from jose import JWTError, jwt
 from bcrypt import checkpw
 from decouple import config
 from db import engine
 from models.relationship_merge import User
+from dataclasses import dataclass
 from functools import wraps
 
 from db import get_db
@@ -21,6 +23,12 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(config("ACCESS_TOKEN_EXPIRE_MINUTES"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login", scopes={})
 
+# Hot statements are built once at import time so each request only binds
+# parameters and reuses the engine's compiled-SQL cache entry.
+user_uuid_exists_stmt = select(User.uuid).where(User.uuid == bindparam("user_uuid"))
+user_by_uuid_stmt = select(User).where(User.uuid == bindparam("user_uuid"))
+user_with_roles_by_uuid_stmt = select(User).options(selectinload(User.roles)).where(User.uuid == bindparam("user_uuid"))
+
 class Token(SQLModel):
     access_token: str
     token_type: str
@@ -29,11 +37,15 @@ class TokenData(SQLModel):
     user_uuid: UUID | None = None
     scopes: list[str] = []
 
+@dataclass(slots=True)
+class AuthenticatedUser:
+    uuid: UUID
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 def get_user(user_uuid: UUID, session: Session) -> User:
-    user = session.exec(select(User).where(User.uuid == user_uuid)).first()
+    user = session.exec(user_by_uuid_stmt, params={"user_uuid": user_uuid}).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -72,9 +84,8 @@ async def get_current_user(security_scopes: SecurityScopes, token: Annotated[str
     except (JWTError, ValidationError):
         raise credentials_exception
     with Session(engine) as session:
-        user = get_user(token_data.user_uuid, session) 
-        if user is None:
-            raise credentials_exception
+        if session.exec(user_uuid_exists_stmt, params={"user_uuid": token_data.user_uuid}).first() is None:
+            raise HTTPException(status_code=404, detail="User not found")
         for scope in security_scopes.scopes:
             if scope not in token_data.scopes:
                 raise HTTPException(
@@ -82,7 +93,7 @@ async def get_current_user(security_scopes: SecurityScopes, token: Annotated[str
                     detail="Not enough permissions",
                     headers={"WWW-Authenticate": authenticate_value},
                 )
-        return user
+        return AuthenticatedUser(uuid=token_data.user_uuid)
 
 def check_roles(allowed_roles: list[str]):
     def decorator(func):
@@ -92,14 +103,15 @@ def check_roles(allowed_roles: list[str]):
             if session is None:
                 raise ValueError("Session must be provided")
             current_user: User = kwargs.get("current_user")
-            current_user: User = session.exec(select(User).options(joinedload(User.roles)).where(User.uuid == current_user.uuid)).first()
+            current_user: User = session.exec(user_with_roles_by_uuid_stmt, params={"user_uuid": current_user.uuid}).first()
             if current_user is None:
                     current_user = await get_current_user(*args, **kwargs)
             if current_user is None:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication credentials were not provided")
-            user_roles = set(role.name for role in current_user.roles)
+            user_roles = set(current_user.role_names)
             if not any(role in user_roles for role in allowed_roles):
                 raise HTTPException(status_code=403, detail="Not enough permissions")
+            kwargs["current_user"] = current_user
             return await func(*args, **kwargs)
         return wrapper
     return decorator
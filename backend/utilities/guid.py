@@ -3,30 +3,33 @@ from uuid import UUID
 from sqlalchemy import Dialect
 from sqlalchemy.sql.type_api import TypeEngine
 from sqlalchemy.types import TypeDecorator, CHAR
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.dialects.sqlite import VARCHAR
 
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
 
-    Uses CHAR(32) as the database type for the GUID.
+    Uses PostgreSQL's native UUID type when available so comparisons and
+    index lookups skip the per-row string cast, and CHAR(36) elsewhere.
     """
 
     impl = CHAR
     cache_ok = True
-    
+
     def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PostgresUUID(as_uuid=True))
         return dialect.type_descriptor(VARCHAR(36))
-    
-    def process_bind_param(self, value: Any | None, dialect: Dialect) -> str | None:
+
+    def process_bind_param(self, value: Any | None, dialect: Dialect) -> UUID | str | None:
         if value is None:
             return value
         elif isinstance(value, UUID):
-            return str(value)
+            return value if dialect.name == "postgresql" else str(value)
         raise ValueError("Value needs to be a UUID instance.")
-    
+
     def process_result_value(self, value: Any | None, dialect: Dialect) -> UUID | None:
-        """Convert string from SQLite to Python UUID."""
-        if value is None:
+        """Convert string from SQLite to Python UUID; Postgres already returns UUIDs."""
+        if value is None or isinstance(value, UUID):
             return value
         return UUID(value)
-